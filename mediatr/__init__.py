@@ -2,9 +2,11 @@ from .mediator import (
     Mediator,
     __handlers__,
     __behaviors__,
+    __notifications__,
     GenericQuery,
     extract_request_type,
-    find_behaviors
+    find_behaviors,
+    find_notifications
     )
 from .exceptions import (
     HandlerNotFoundError,
@@ -20,9 +22,12 @@ __all__ = [
     "Mediator",
     "__handlers__",
     "__behaviors__",
+    "__notifications__",
     "__version__",
+    "GenericQuery",
     "extract_request_type",
     "find_behaviors",
+    "find_notifications",
     "HandlerNotFoundError",
     "InvalidRequest",
     "InvalidHandlerError",
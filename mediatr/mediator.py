@@ -1,4 +1,9 @@
+import asyncio
 import inspect
+from functools import partial
+import linecache
+import sys
+from types import CoroutineType, GeneratorType
 from typing import Any, Awaitable, Callable, Optional, TypeVar, Generic, Union
 from enum import Enum
 
@@ -17,9 +22,55 @@ class RequestType(Enum):
     BEHAVIOR = 2
 
 
-__handlers__ = {}
-__notifications__ = {}
-__behaviors__ = {}
+# plans work with (kind, target, is_coroutine) entries of registered targets,
+# where is_coroutine tells that calling the function or `handle` method of the
+# class always returns a coroutine
+_KIND_FUNC = 0
+_KIND_CLASS = 1
+
+class _Registry(dict):
+    """Registry dictionary that resets cached dispatch plans when it is changed.
+
+    Lists stored as values are not tracked, register through `Mediator` to extend them.
+    """
+
+    def __setitem__(self, key, value):
+        _plan_cache.clear()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        _plan_cache.clear()
+        super().__delitem__(key)
+
+    def clear(self):
+        _plan_cache.clear()
+        super().clear()
+
+    def pop(self, *args):
+        _plan_cache.clear()
+        return super().pop(*args)
+
+    def popitem(self):
+        _plan_cache.clear()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        _plan_cache.clear()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        _plan_cache.clear()
+        super().update(*args, **kwargs)
+
+
+__handlers__ = _Registry()
+__notifications__ = _Registry()
+__behaviors__ = _Registry()
+
+# request class -> _Plan, reset whenever registries change
+_plan_cache = {}
+
+_MISSING = object()
 
 TResponse = TypeVar("TResponse")
 
@@ -28,7 +79,6 @@ class GenericQuery(Generic[TResponse]):
     pass
 
 
-@staticmethod
 def default_handler_class_manager(HandlerCls: type):
     return HandlerCls()
 
@@ -53,97 +103,297 @@ def extract_request_type(handler, request_type: RequestType) -> type:
     elif request_type == RequestType.BEHAVIOR:
         raise_if_behavior_is_invalid(handler)
 
-    sign = inspect.signature(func)
-    items = list(sign.parameters)
+    return _first_annotation(func, skip_self=not isfunc)
+
+
+def _first_annotation(func, skip_self: bool):
+    """Annotation of the request argument, read without building `inspect.Signature`"""
+    func = inspect.unwrap(func)
+    code = func.__code__
+    name = code.co_varnames[1 if skip_self else 0]
+    annotation = func.__annotations__.get(name, inspect.Parameter.empty)
+    if isinstance(annotation, str):
+        annotation = _resolve_annotation(annotation, func)
+    return annotation
+
+
+def _resolve_annotation(annotation: str, func):
+    """Resolve postponed (string) annotation to the request class (or `Any`) where
+    possible, otherwise keep the interned name for the `__name__` fallback lookup"""
+    try:
+        resolved = eval(annotation, func.__globals__)
+    except Exception:
+        return sys.intern(annotation)
+    if isinstance(resolved, type) or resolved is Any:
+        return resolved
+    return sys.intern(annotation)
+
+
+def _needs_await(result) -> bool:
+    """Cheaper equivalent of `inspect.isawaitable` for values returned by handlers"""
+    cls = type(result)
     return (
-        sign.parameters.get(items[0]).annotation
-        if isfunc
-        else sign.parameters.get(items[1]).annotation
+        cls is CoroutineType
+        or hasattr(cls, "__await__")
+        or (
+            cls is GeneratorType
+            and bool(result.gi_code.co_flags & inspect.CO_ITERABLE_COROUTINE)
+        )
     )
 
 
 async def __return_await__(result):
-    return (
-        await result
-        if inspect.isawaitable(result) or inspect.iscoroutine(result)
-        else result
-    )
+    return await result if _needs_await(result) else result
+
+
+def _find_in_mro(registry: dict, request) -> list:
+    result = []
+    for cls in request.__class__.__mro__:
+        val = registry.get(cls)
+        if val:
+            result.extend(val)
+    val = registry.get(Any)
+    if val:
+        result.extend(val)
+    return result
 
 
 def find_behaviors(request):
-    r_class = request.__class__
-    behaviors = []
-    for key, val in __behaviors__.items():
-        if key == r_class or issubclass(r_class, key) or key == Any:
-            behaviors = behaviors + val
-    return behaviors
+    return _find_in_mro(__behaviors__, request)
 
 
 def find_notifications(request):
-    r_class = request.__class__
-    notifications = []
-    for key, val in __notifications__.items():
-        if key == r_class or issubclass(r_class, key) or key == Any:
-            notifications = notifications + val
-    return notifications
+    return _find_in_mro(__notifications__, request)
 
 
-class Mediator:
-    """Class of mediator as entry point to send requests and get responses"""
+def _registry_entry(target):
+    if inspect.isfunction(target):
+        return (_KIND_FUNC, target, inspect.iscoroutinefunction(target))
+    return (
+        _KIND_CLASS,
+        target,
+        inspect.iscoroutinefunction(getattr(target, "handle", None)),
+    )
 
-    handler_class_manager = default_handler_class_manager
 
-    def __init__(self, handler_class_manager: Callable = None):
-        if handler_class_manager:
-            self.handler_class_manager = handler_class_manager
+def _is_stateful(entry) -> bool:
+    (kind, target, _) = entry
+    return kind is _KIND_CLASS and getattr(target, "__mediatr_stateful__", False)
 
-    def __before_send(
-        self: Union["Mediator", GenericQuery[TResponse]],
-        request: Optional[GenericQuery[TResponse]] = None,
-    ):
-        self1 = Mediator if not request else self
-        request = request or self
 
-        raise_if_request_none(request)
+class _Plan:
+    """Registered handler, behaviors and notifications resolved for one request class"""
 
-        notifications = find_notifications(request)
+    __slots__ = (
+        "handler",
+        "behaviors",
+        "notifications",
+        "cacheable",
+        "default_funcs",
+        "dispatch",
+        "dispatch_async",
+        "dispatch_async_custom",
+    )
+
+    def __init__(self, handler, behaviors, notifications):
+        self.handler = handler
+        self.behaviors = behaviors
+        self.notifications = notifications
+        self.cacheable = not any(
+            _is_stateful(e) for e in [handler, *behaviors, *notifications] if e
+        )
+        # functions resolved with the default handler class manager, filled on first use
+        self.default_funcs = None
+        self.dispatch = None
+        self.dispatch_async = None
+        self.dispatch_async_custom = None
+        if handler:
+            entries = [handler, *behaviors]
+            self.dispatch = _get_dispatcher(len(behaviors), False)
+            self.dispatch_async = _get_dispatcher(
+                len(behaviors), True, tuple(e[2] for e in entries)
+            )
+            # custom manager may return any object for a class, so its `handle`
+            # is only known to be a coroutine function for registered functions
+            self.dispatch_async_custom = _get_dispatcher(
+                len(behaviors),
+                True,
+                tuple(e[0] is _KIND_FUNC and e[2] for e in entries),
+            )
+
+    def resolve(self, manager):
+        handler_func = _get_function(manager, self.handler) if self.handler else None
+        behavior_funcs = tuple(_get_function(manager, b) for b in self.behaviors)
+        notification_funcs = tuple(
+            _get_function(manager, n) for n in self.notifications
+        )
+        return (handler_func, behavior_funcs, notification_funcs)
+
+
+def _get_function(manager, entry):
+    (kind, target, _) = entry
+    if kind is _KIND_FUNC:
+        return target
+    return manager(target).handle
+
+
+def _build_plan(request):
+    r_class = request.__class__
 
-        handler = None
-        if __handlers__.get(request.__class__):
-            handler = __handlers__[request.__class__]
-        elif __handlers__.get(request.__class__.__name__):
-            handler = __handlers__[request.__class__.__name__]
+    notifications = [
+        _registry_entry(n) for n in _find_in_mro(__notifications__, request)
+    ]
 
-        if not handler and notifications:
-            return (self1, [], notifications)
+    handler = __handlers__.get(r_class, _MISSING)
+    if handler is _MISSING:
+        handler = __handlers__.get(r_class.__name__)
 
-        raise_if_handler_not_found(handler, request)
+    if not handler and notifications:
+        return _Plan(None, [], notifications)
 
-        handler_func = None
-        handler_obj = None
-        if inspect.isfunction(handler):
-            handler_func = handler
-        else:
-            handler_obj = self1.handler_class_manager(handler)
-            handler_func = handler_obj.handle
+    raise_if_handler_not_found(handler, request)
 
-        behaviors = find_behaviors(request)
-        behaviors.append(lambda r, next: handler_func(r))
+    behaviors = [_registry_entry(b) for b in _find_in_mro(__behaviors__, request)]
 
-        return (self1, behaviors, notifications)
+    return _Plan(_registry_entry(handler), behaviors, notifications)
 
-    def __get_function(self, self1, target):
-        target_func = None
-        if inspect.isfunction(target):
-            target_func = target
+
+def _dispatcher_source(behaviors_count: int, is_async: bool, coroutines: tuple) -> str:
+    """Source of pipeline function `dispatch(request, handler, b0, b1, ...)`.
+
+    Every behavior gets its own `next_<i>` closure calling the following behavior.
+    The last behavior gets `partial(handler, request)` as `next`, unless in async
+    mode the handler is not a coroutine function and `next` has to be a closure
+    returning awaitable. `coroutines` holds is_coroutine flags of handler and
+    behaviors: results of coroutine functions are awaited without checks.
+    """
+    async_ = "async " if is_async else ""
+    args = "".join(", b{}".format(i) for i in range(behaviors_count))
+    lines = ["{}def dispatch(request, handler{}):".format(async_, args)]
+
+    def call_step(indent, call, is_coroutine):
+        if not is_async:
+            lines.append(indent + "return " + call)
+        elif is_coroutine:
+            lines.append(indent + "return await " + call)
         else:
-            target_obj = self1.handler_class_manager(target)
-            target_func = target_obj.handle
-        return target_func
+            lines.append(indent + "result = " + call)
+            lines.append(
+                indent + "return await result if _needs_await(result) else result"
+            )
+
+    handler_partial = not is_async or coroutines[0]
+
+    def next_arg(i):
+        if i == behaviors_count and handler_partial:
+            return "partial(handler, request)"
+        return "next_{}".format(i)
+
+    if behaviors_count:
+        if not handler_partial:
+            lines.append("    async def next_{}():".format(behaviors_count))
+            call_step("        ", "handler(request)", False)
+        for i in range(behaviors_count - 1, 0, -1):
+            lines.append("    {}def next_{}():".format(async_, i))
+            call_step(
+                "        ",
+                "b{}(request, {})".format(i, next_arg(i + 1)),
+                is_async and coroutines[i + 1],
+            )
+        call_step(
+            "    ", "b0(request, {})".format(next_arg(1)), is_async and coroutines[1]
+        )
+    else:
+        call_step("    ", "handler(request)", is_async and coroutines[0])
+
+    return "\n".join(lines) + "\n"
+
+
+def _compile_dispatcher(behaviors_count: int, is_async: bool, coroutines: tuple):
+    source = _dispatcher_source(behaviors_count, is_async, coroutines)
+    filename = "<mediatr dispatch {}{}>".format(
+        behaviors_count,
+        " async " + "".join("1" if c else "0" for c in coroutines) if is_async else "",
+    )
+    namespace = {}
+    exec(
+        compile(source, filename, "exec"),
+        {"_needs_await": _needs_await, "partial": partial},
+        namespace,
+    )
+    # keep generated source available for tracebacks
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    return namespace["dispatch"]
+
+
+# (behaviors count, is_async, is_coroutine flags) -> generated pipeline function
+_dispatchers = {}
+
+
+def _get_dispatcher(behaviors_count: int, is_async: bool, coroutines: tuple = ()):
+    key = (behaviors_count, is_async, coroutines)
+    dispatcher = _dispatchers.get(key)
+    if dispatcher is None:
+        dispatcher = _dispatchers[key] = _compile_dispatcher(
+            behaviors_count, is_async, coroutines
+        )
+    return dispatcher
+
+
+def _before_send(
+    self: Union["Mediator", GenericQuery[TResponse]],
+    request: Optional[GenericQuery[TResponse]] = None,
+):
+    if request:
+        # class attribute is read from the class, so a plain function is not bound
+        manager = (
+            self.__dict__.get("handler_class_manager")
+            or type(self).handler_class_manager
+        )
+    else:
+        # called statically as Mediator.send(request)
+        manager = Mediator.handler_class_manager
+        request = self
+
+    raise_if_request_none(request)
+
+    r_class = request.__class__
+    plan = _plan_cache.get(r_class)
+    if plan is None:
+        plan = _plan_cache[r_class] = _build_plan(request)
+
+    if manager is not default_handler_class_manager:
+        return (
+            request,
+            plan.dispatch,
+            plan.dispatch_async_custom,
+            *plan.resolve(manager),
+        )
+
+    if not plan.cacheable:
+        return (request, plan.dispatch, plan.dispatch_async, *plan.resolve(manager))
+
+    # default manager only instantiates classes, so their objects can be reused
+    funcs = plan.default_funcs
+    if funcs is None:
+        funcs = plan.default_funcs = plan.resolve(manager)
+    return (request, plan.dispatch, plan.dispatch_async, *funcs)
+
+
+class Mediator:
+    """Class of mediator as entry point to send requests and get responses"""
+
+    # class level manager, used by static calls and by instances created without one
+    handler_class_manager = staticmethod(default_handler_class_manager)
+
+    def __init__(self, handler_class_manager: Callable = None):
+        if handler_class_manager:
+            self.handler_class_manager = handler_class_manager
 
     async def send_async(
         self: Union["Mediator", GenericQuery[TResponse]],
         request: Optional[GenericQuery[TResponse]] = None,
+        parallel_notifications: bool = True,
     ) -> Awaitable[TResponse]:
         """
         Send request in async mode and getting response
@@ -151,28 +401,61 @@ class Mediator:
         Args:
         request (`object`): object of request class
 
+        parallel_notifications (`bool`): await async notifications concurrently with
+        `asyncio.gather`. Pass `False` to await them one by one in registration order
+
         Returns:
 
         awaitable response
 
         """
 
-        (self1, behaviors, notifications) = self.__before_send(request)
-
-        beh_result = None
-        if behaviors:
-
-            async def start_func(i: int):
-                beh_func = self.__get_function(self1, behaviors[i])
-                return await __return_await__(
-                    beh_func(request, lambda: start_func(i + 1))
-                )
+        (
+            request,
+            dispatch,
+            dispatch_async,
+            handler_func,
+            behavior_funcs,
+            notification_funcs,
+        ) = _before_send(self, request)
 
-            beh_result = await start_func(0)
+        if not behavior_funcs and not notification_funcs:
+            result = handler_func(request)
+            return await result if _needs_await(result) else result
 
-        for notification in notifications:
-            n_func = self.__get_function(self1, notification)
-            await __return_await__(n_func(request))
+        beh_result = None
+        if handler_func:
+            beh_result = await dispatch_async(request, handler_func, *behavior_funcs)
+
+        if parallel_notifications:
+            pending = []
+            try:
+                for n_func in notification_funcs:
+                    result = n_func(request)
+                    if _needs_await(result):
+                        pending.append(result)
+            except BaseException:
+                # coroutines created before the failure would never be awaited
+                for result in pending:
+                    close = getattr(result, "close", None)
+                    if close:
+                        close()
+                raise
+            if pending:
+                futures = [asyncio.ensure_future(result) for result in pending]
+                try:
+                    await asyncio.gather(*futures)
+                except BaseException:
+                    # stop other notifications and wait for them, so they don't run
+                    # unobserved after the error is raised
+                    for future in futures:
+                        if not future.done():
+                            future.cancel()
+                    await asyncio.gather(*futures, return_exceptions=True)
+                    raise
+        else:
+            for n_func in notification_funcs:
+                await __return_await__(n_func(request))
 
         return beh_result
 
@@ -192,19 +475,23 @@ class Mediator:
 
         """
 
-        (self1, behaviors, notifications) = self.__before_send(request)
+        (
+            request,
+            dispatch,
+            dispatch_async,
+            handler_func,
+            behavior_funcs,
+            notification_funcs,
+        ) = _before_send(self, request)
 
-        beh_result = None
-        if behaviors:
+        if not behavior_funcs and not notification_funcs:
+            return handler_func(request)
 
-            def start_func(i: int):
-                beh_func = self.__get_function(self1, behaviors[i])
-                return beh_func(request, lambda: start_func(i + 1))
-
-            beh_result = start_func(0)
+        beh_result = None
+        if handler_func:
+            beh_result = dispatch(request, handler_func, *behavior_funcs)
 
-        for notification in notifications:
-            n_func = self.__get_function(self1, notification)
+        for n_func in notification_funcs:
             n_func(request)
 
         return beh_result
@@ -219,26 +506,23 @@ class Mediator:
     def register_handler(handler):
         """Append handler function or class to global handlers dictionary"""
         request_type = extract_request_type(handler, RequestType.HANDLER)
-        if not __handlers__.get(request_type):
-            __handlers__[request_type] = handler
+        __handlers__.setdefault(request_type, handler)
 
     @staticmethod
     def register_notification(handler):
         """Append notification function or class to global notifications dictionary"""
         request_type = extract_request_type(handler, RequestType.NOTIFICATION)
-        if not __notifications__.get(request_type):
-            __notifications__[request_type] = []
-        if not any(x == handler for x in __notifications__[request_type]):
-            __notifications__[request_type].append(handler)
+        notifications = __notifications__.setdefault(request_type, [])
+        if handler not in notifications:
+            notifications.append(handler)
 
     @staticmethod
     def register_behavior(behavior):
         """Append behavior function or class to global behaviors dictionary"""
         request_type = extract_request_type(behavior, RequestType.BEHAVIOR)
-        if not __behaviors__.get(request_type):
-            __behaviors__[request_type] = []
-        if not any(x == behavior for x in __behaviors__[request_type]):
-            __behaviors__[request_type].append(behavior)
+        behaviors = __behaviors__.setdefault(request_type, [])
+        if behavior not in behaviors:
+            behaviors.append(behavior)
 
     @staticmethod
     def handler(handler):
@@ -257,3 +541,14 @@ class Mediator:
         """Append behavior function or class to global behaviors dictionary"""
         Mediator.register_behavior(behavior)
         return behavior
+
+    @staticmethod
+    def stateful(handler_cls):
+        """Mark handler or behavior class to be instantiated on every request.
+
+        By default objects of handler classes are created once and reused while
+        the mediator uses the default handler class manager.
+        """
+        handler_cls.__mediatr_stateful__ = True
+        _plan_cache.clear()
+        return handler_cls
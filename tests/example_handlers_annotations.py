@@ -1,4 +1,5 @@
 from __future__ import annotations
+from typing import Any
 from tests.example_queries import GetArrayQueryWithAnnotations
 
 
@@ -10,3 +11,8 @@ class GetArrayQueryHandlerWithAnnotations():
             items.append(i)
         
         return items
+
+
+def any_behavior_with_annotations(request: Any, next):
+    request.any_behavior_handled = True
+    return next()
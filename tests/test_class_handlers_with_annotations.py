@@ -2,7 +2,7 @@ import sys
 import asyncio
 import unittest
 
-from mediatr import Mediator
+from mediatr import Mediator, __handlers__
 
 
 class ClassHandlersTest(unittest.TestCase):
@@ -22,3 +22,25 @@ class ClassHandlersTest(unittest.TestCase):
         self.assertEqual(query.items_count, 5)
         array_count = len(result)
         self.assertEqual(5, array_count)
+
+    @unittest.skipUnless(sys.version_info >= (3,7), "requires 3.7+")
+    def test_postponed_annotation_resolved_to_class(self):
+        from tests.example_handlers_annotations import GetArrayQueryHandlerWithAnnotations
+        from tests.example_queries import GetArrayQueryWithAnnotations
+        Mediator.register_handler(GetArrayQueryHandlerWithAnnotations)
+        self.assertIn(GetArrayQueryWithAnnotations, __handlers__)
+
+    @unittest.skipUnless(sys.version_info >= (3,7), "requires 3.7+")
+    def test_postponed_any_behavior(self):
+        from tests.example_handlers_annotations import GetArrayQueryHandlerWithAnnotations, \
+            any_behavior_with_annotations
+        from tests.example_queries import GetArrayQueryWithAnnotations
+        Mediator.clear()
+        try:
+            Mediator.register_handler(GetArrayQueryHandlerWithAnnotations)
+            Mediator.register_behavior(any_behavior_with_annotations)
+            query = GetArrayQueryWithAnnotations(5)
+            Mediator.send(query)
+            self.assertTrue(query.any_behavior_handled)
+        finally:
+            Mediator.clear()
@@ -0,0 +1,141 @@
+import asyncio
+import unittest
+
+from mediatr import Mediator
+from mediatr.mediator import default_handler_class_manager
+
+
+class CountInstancesQuery():
+    pass
+
+
+class CountInstancesQueryHandler():
+    instances = 0
+
+    def __init__(self):
+        CountInstancesQueryHandler.instances += 1
+
+    def handle(self, request: CountInstancesQuery):
+        return CountInstancesQueryHandler.instances
+
+
+class StatefulQuery():
+    pass
+
+
+@Mediator.stateful
+class StatefulQueryHandler():
+    instances = 0
+
+    def __init__(self):
+        StatefulQueryHandler.instances += 1
+
+    def handle(self, request: StatefulQuery):
+        return StatefulQueryHandler.instances
+
+
+class FakeManagerQuery():
+    pass
+
+
+class FakeManagerQueryHandler():
+    async def handle(self, request: FakeManagerQuery):
+        return 0
+
+
+async def fake_manager_query_behavior(request: FakeManagerQuery, next):
+    return await next()
+
+
+class FakeHandler():
+    def handle(self, request):
+        return 42
+
+
+class HandlerInstancesTest(unittest.TestCase):
+    def setUp(self):
+        Mediator.clear()
+        CountInstancesQueryHandler.instances = 0
+        StatefulQueryHandler.instances = 0
+
+    def tearDown(self):
+        Mediator.clear()
+
+    def test_default_manager_reuses_handler(self):
+        Mediator.register_handler(CountInstancesQueryHandler)
+        mediator = Mediator()
+        mediator.send(CountInstancesQuery())
+        self.assertEqual(mediator.send(CountInstancesQuery()), 1)
+        self.assertEqual(Mediator.send(CountInstancesQuery()), 1)
+
+    def test_stateful_handler_instantiated_per_request(self):
+        Mediator.register_handler(StatefulQueryHandler)
+        mediator = Mediator()
+        mediator.send(StatefulQuery())
+        self.assertEqual(mediator.send(StatefulQuery()), 2)
+
+    def test_custom_manager_called_per_request(self):
+        created = []
+
+        def manager(handler_cls, is_behavior=False):
+            created.append(handler_cls)
+            return handler_cls()
+
+        Mediator.register_handler(CountInstancesQueryHandler)
+        mediator = Mediator(manager)
+        mediator.send(CountInstancesQuery())
+        mediator.send(CountInstancesQuery())
+        self.assertEqual(len(created), 2)
+
+    def test_class_level_manager(self):
+        created = []
+
+        def manager(handler_cls, is_behavior=False):
+            created.append(handler_cls)
+            return handler_cls()
+
+        Mediator.register_handler(CountInstancesQueryHandler)
+        Mediator.handler_class_manager = manager
+        try:
+            Mediator.send(CountInstancesQuery())
+            Mediator().send(CountInstancesQuery())
+        finally:
+            Mediator.handler_class_manager = staticmethod(default_handler_class_manager)
+        self.assertEqual(len(created), 2)
+
+    def test_custom_manager_returning_sync_handler(self):
+        Mediator.register_handler(FakeManagerQueryHandler)
+        Mediator.register_behavior(fake_manager_query_behavior)
+        mediator = Mediator(lambda handler_cls: FakeHandler())
+        ioloop = asyncio.new_event_loop()
+        result = ioloop.run_until_complete(mediator.send_async(FakeManagerQuery()))
+        ioloop.close()
+        self.assertEqual(result, 42)
+
+    def test_instance_manager_attribute(self):
+        created = []
+
+        def manager(handler_cls, is_behavior=False):
+            created.append(handler_cls)
+            return handler_cls()
+
+        Mediator.register_handler(CountInstancesQueryHandler)
+        self.assertIs(Mediator(manager).handler_class_manager, manager)
+        mediator = Mediator()
+        mediator.handler_class_manager = manager
+        mediator.send(CountInstancesQuery())
+        self.assertEqual(len(created), 1)
+
+    def test_subclass_manager(self):
+        created = []
+
+        def manager(handler_cls, is_behavior=False):
+            created.append(handler_cls)
+            return handler_cls()
+
+        class CustomMediator(Mediator):
+            handler_class_manager = staticmethod(manager)
+
+        Mediator.register_handler(CountInstancesQueryHandler)
+        CustomMediator().send(CountInstancesQuery())
+        self.assertEqual(len(created), 1)
@@ -3,6 +3,7 @@ import unittest
 
 from mediatr import __behaviors__, __handlers__, Mediator
 from tests.example_handlers import get_array_handler, get_array_query_behavior
+from tests.example_queries import GetArrayQuery
 
 
 class InitMediatorTest(unittest.TestCase):
@@ -22,6 +23,12 @@ class InitMediatorTest(unittest.TestCase):
         Mediator.register_behavior(get_array_query_behavior)
         self.assertEqual(len(__behaviors__.keys()), 1)
 
+    def test_registries_hold_registered_targets(self):
+        Mediator.register_handler(get_array_handler)
+        Mediator.register_behavior(get_array_query_behavior)
+        self.assertIs(__handlers__[GetArrayQuery], get_array_handler)
+        self.assertEqual(__behaviors__[GetArrayQuery], [get_array_query_behavior])
+
     def test_is_func(self):
         self.assertTrue(inspect.isfunction(Mediator.register_handler))
 
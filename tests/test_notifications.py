@@ -0,0 +1,105 @@
+import asyncio
+import gc
+import unittest
+import warnings
+
+from mediatr import Mediator
+
+
+class UserCreatedEvent():
+    def __init__(self):
+        self.log = []
+
+
+async def send_email_notification(request: UserCreatedEvent):
+    request.log.append('email start')
+    await asyncio.sleep(0)
+    request.log.append('email end')
+
+
+async def write_audit_notification(request: UserCreatedEvent):
+    request.log.append('audit start')
+    await asyncio.sleep(0)
+    request.log.append('audit end')
+
+
+def count_notification(request: UserCreatedEvent):
+    request.log.append('count')
+
+
+def failing_notification(request: UserCreatedEvent):
+    raise ValueError('failed')
+
+
+async def failing_notification_async(request: UserCreatedEvent):
+    await asyncio.sleep(0)
+    raise ValueError('failed')
+
+
+async def slow_notification(request: UserCreatedEvent):
+    request.log.append('slow start')
+    await asyncio.sleep(0.05)
+    request.log.append('slow end')
+
+
+class NotificationsTest(unittest.TestCase):
+    def setUp(self):
+        Mediator.clear()
+        self.ioloop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        Mediator.clear()
+        self.ioloop.close()
+
+    def test_notifications_run_concurrently(self):
+        Mediator.register_notification(send_email_notification)
+        Mediator.register_notification(write_audit_notification)
+        Mediator.register_notification(count_notification)
+        event = UserCreatedEvent()
+        result = self.ioloop.run_until_complete(Mediator().send_async(event))
+        self.assertIsNone(result)
+        self.assertEqual(event.log[0], 'count')
+        self.assertEqual(
+            sorted(event.log[1:3]), ['audit start', 'email start'])
+        self.assertEqual(sorted(event.log[3:]), ['audit end', 'email end'])
+
+    def test_failing_notification_closes_pending(self):
+        Mediator.register_notification(send_email_notification)
+        Mediator.register_notification(failing_notification)
+        event = UserCreatedEvent()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            with self.assertRaises(ValueError):
+                self.ioloop.run_until_complete(Mediator().send_async(event))
+            gc.collect()
+        self.assertEqual(event.log, [])
+        self.assertFalse(
+            [w for w in caught if 'never awaited' in str(w.message)])
+
+    def test_notifications_run_sequentially(self):
+        Mediator.register_notification(send_email_notification)
+        Mediator.register_notification(write_audit_notification)
+        event = UserCreatedEvent()
+        self.ioloop.run_until_complete(
+            Mediator().send_async(event, parallel_notifications=False))
+        self.assertEqual(
+            event.log, ['email start', 'email end', 'audit start', 'audit end'])
+
+    def test_notifications_sync(self):
+        Mediator.register_notification(count_notification)
+        event = UserCreatedEvent()
+        Mediator().send(event)
+        self.assertEqual(event.log, ['count'])
+
+    def test_failing_async_notification_cancels_others(self):
+        Mediator.register_notification(slow_notification)
+        Mediator.register_notification(failing_notification_async)
+        errors = []
+        self.ioloop.set_exception_handler(lambda loop, context: errors.append(context))
+        event = UserCreatedEvent()
+        with self.assertRaises(ValueError):
+            self.ioloop.run_until_complete(Mediator().send_async(event))
+        self.ioloop.run_until_complete(asyncio.sleep(0.1))
+        gc.collect()
+        self.assertEqual(event.log, ['slow start'])
+        self.assertEqual(errors, [])
@@ -0,0 +1,123 @@
+import asyncio
+import unittest
+from typing import Any
+
+from mediatr import Mediator
+
+
+class RetryQuery():
+    def __init__(self):
+        self.calls = 0
+
+
+def retry_query_handler(request: RetryQuery):
+    request.calls += 1
+    return request.calls
+
+
+def retry_behavior(request: RetryQuery, next):
+    next()
+    return next()
+
+
+async def retry_query_handler_async(request: RetryQuery):
+    request.calls += 1
+    return request.calls
+
+
+async def retry_behavior_async(request: RetryQuery, next):
+    await next()
+    return await next()
+
+
+class AsyncClassQuery():
+    pass
+
+
+class AsyncClassQueryHandler():
+    async def handle(self, request: AsyncClassQuery):
+        return ['handler']
+
+
+class AsyncClassQueryBehavior():
+    async def handle(self, request: AsyncClassQuery, next):
+        result = await next()
+        result.append('behavior')
+        return result
+
+
+class DerivedRetryQuery(RetryQuery):
+    def __init__(self):
+        super().__init__()
+        self.trace = []
+
+
+def derived_retry_query_handler(request: DerivedRetryQuery):
+    return request.trace
+
+
+def derived_trace_behavior(request: DerivedRetryQuery, next):
+    request.trace.append('derived')
+    return next()
+
+
+def base_trace_behavior(request: RetryQuery, next):
+    request.trace.append('base')
+    return next()
+
+
+def object_trace_behavior(request: object, next):
+    request.trace.append('object')
+    return next()
+
+
+def any_trace_behavior(request: Any, next):
+    request.trace.append('any')
+    return next()
+
+
+class PipelineTest(unittest.TestCase):
+    def setUp(self):
+        Mediator.clear()
+
+    def tearDown(self):
+        Mediator.clear()
+
+    def test_behavior_calls_next_twice(self):
+        Mediator.register_handler(retry_query_handler)
+        Mediator.register_behavior(retry_behavior)
+        query = RetryQuery()
+        self.assertEqual(Mediator().send(query), 2)
+
+    def test_behavior_calls_next_twice_async(self):
+        Mediator.register_handler(retry_query_handler_async)
+        Mediator.register_behavior(retry_behavior_async)
+        query = RetryQuery()
+        ioloop = asyncio.new_event_loop()
+        result = ioloop.run_until_complete(Mediator().send_async(query))
+        ioloop.close()
+        self.assertEqual(result, 2)
+
+    def test_behaviors_follow_mro(self):
+        Mediator.register_handler(derived_retry_query_handler)
+        Mediator.register_behavior(object_trace_behavior)
+        Mediator.register_behavior(base_trace_behavior)
+        Mediator.register_behavior(derived_trace_behavior)
+        result = Mediator().send(DerivedRetryQuery())
+        self.assertEqual(result, ['derived', 'base', 'object'])
+
+    def test_async_class_handler_and_behavior(self):
+        Mediator.register_handler(AsyncClassQueryHandler)
+        Mediator.register_behavior(AsyncClassQueryBehavior)
+        ioloop = asyncio.new_event_loop()
+        result = ioloop.run_until_complete(Mediator().send_async(AsyncClassQuery()))
+        ioloop.close()
+        self.assertEqual(result, ['handler', 'behavior'])
+
+    def test_any_behaviors_run_after_class_behaviors(self):
+        Mediator.register_handler(derived_retry_query_handler)
+        Mediator.register_behavior(any_trace_behavior)
+        Mediator.register_behavior(object_trace_behavior)
+        Mediator.register_behavior(derived_trace_behavior)
+        result = Mediator().send(DerivedRetryQuery())
+        self.assertEqual(result, ['derived', 'object', 'any'])
@@ -0,0 +1,39 @@
+import unittest
+
+from mediatr import Mediator, HandlerNotFoundError, __behaviors__, __handlers__
+from tests.example_handlers import common_log_behavior, get_array_handler_sync
+from tests.example_queries import GetArrayQuery
+
+
+class PlanCacheTest(unittest.TestCase):
+    def setUp(self):
+        Mediator.clear()
+
+    def tearDown(self):
+        Mediator.clear()
+
+    def test_registration_after_send(self):
+        Mediator.register_handler(get_array_handler_sync)
+        mediator = Mediator()
+        query1 = GetArrayQuery(5)
+        self.assertEqual(len(mediator.send(query1)), 5)
+        self.assertFalse(hasattr(query1, 'updated_at'))
+
+        Mediator.register_behavior(common_log_behavior)
+        query2 = GetArrayQuery(5)
+        self.assertEqual(len(mediator.send(query2)), 5)
+        self.assertEqual(query2.updated_at, '123')
+
+    def test_registries_cleared_directly(self):
+        Mediator.register_handler(get_array_handler_sync)
+        Mediator.register_behavior(common_log_behavior)
+        Mediator.send(GetArrayQuery(5))
+
+        __behaviors__.clear()
+        query = GetArrayQuery(5)
+        Mediator.send(query)
+        self.assertFalse(hasattr(query, 'updated_at'))
+
+        __handlers__.clear()
+        with self.assertRaises(HandlerNotFoundError):
+            Mediator.send(GetArrayQuery(5))